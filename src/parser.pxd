@@ -0,0 +1,35 @@
+# Augmenting declarations for compiling parser.py with Cython:
+#     cythonize -i src/parser.py
+# parser.py stays plain Python; these declarations only apply when it is
+# compiled, turning Parser into an extension type with typed fields.
+
+cimport cython
+from cpython cimport array
+
+cdef class Parser:
+    cdef public bytes types
+    cdef public tuple values
+    cdef public array.array lines
+    cdef public Py_ssize_t n, pos
+
+    @cython.locals(pos=Py_ssize_t)
+    cpdef error(self, message)
+    cpdef advance(self)
+    @cython.locals(pos=Py_ssize_t, t_type=int)
+    cpdef eat(self, int token_type, value=*)
+    cpdef expect(self, str value)
+    cpdef parse(self)
+    cpdef program(self)
+    cpdef statement_list(self)
+    @cython.locals(pos=Py_ssize_t, t_type=int)
+    cpdef bint try_statement(self) except -1
+    cpdef statement(self)
+    # block and the if/while/for/return rules stay plain methods: they are
+    # only called through _STMT_HANDLERS, which needs Python-level methods.
+    cpdef declaration(self)
+    cpdef assignment(self)
+    @cython.locals(pos=Py_ssize_t)
+    cpdef expression(self)
+
+@cython.locals(depth=Py_ssize_t, t_type=int)
+cpdef Py_ssize_t _parse_expression(bytes types, tuple values, Py_ssize_t pos) except -1
@@ -1,44 +1,107 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+from array import array
+from functools import lru_cache
+
 from scanner import tokenize
 
+# Token types are mapped to small integer codes once, up front, so every
+# type check in the parser is an int comparison instead of a string compare.
+# 'EOF' is never produced by the scanner; it only tags the end-of-input
+# sentinel the parser appends to its token lists.
+TYPE_NAMES = ('Keywords', 'Operators', 'Special_characters', 'Identifiers', 'Numeric_constants', 'Character_constants', 'EOF')
+TYPE_MAP = {name: code for code, name in enumerate(TYPE_NAMES)}
+_KW, _OP, _SC, _ID, _NUM, _CHAR, _EOF = range(len(TYPE_NAMES))
+
+# Value sets checked on every token, hoisted so membership is a hash lookup.
+_TYPES = frozenset(('int', 'float', 'double', 'bool', 'char', 'string', 'void'))
+_BOOL_LITERALS = frozenset(('true', 'false'))
+# Operators of <expression>, <comparison> and <term>.
+_BINARY_OPS = frozenset(('==', '!=', '<', '<=', '>', '>=', '+', '-', '*', '/'))
+
+class ParseError(SyntaxError):
+    """Syntax error raised by Parser.
+
+    Only the message and the offending token's line, value and type name
+    (all None at end of input) are stored; the full text is formatted when
+    the error is actually shown, so callers that catch and discard parse
+    errors never pay for it.
+    """
+    def __init__(self, message, line=None, value=None, token_type=None):
+        # Passing the fields up keeps args, repr(), pickling and copying working.
+        super().__init__(message, line, value, token_type)
+        self.message = message
+        self.line = line
+        self.value = value
+        self.token_type = token_type
+
+    def __str__(self):
+        if self.line is None:
+            return f"Syntax error at end of input: {self.message}"
+        return f"Syntax error at line {self.line}: {self.message}. Found '{self.value}' ({self.token_type})"
+
+    # Used by the traceback module when the error is printed uncaught.
+    @property
+    def msg(self):
+        return str(self)
+
 class Parser:
     def __init__(self, tokens):
-        # Filter out comments and other non-essential tokens if any
-        self.tokens = [t for t in tokens if t.type != 'Comments']
+        # Filter out comments and other non-essential tokens if any.
+        # One pass over `tokens` (a list or any iterable, e.g. a generator)
+        # fills three compact parallel sequences indexed by self.pos: one-byte
+        # type codes, the token values, and line numbers for error().
+        # types and values end with an EOF sentinel, so self.types[self.pos] is
+        # always valid and rules test for _EOF instead of bounds-checking.
+        types = bytearray()
+        values = []
+        lines = array('I')
+        add_type, add_value, add_line = types.append, values.append, lines.append
+        for t in tokens:
+            if t.type != 'Comments':
+                add_type(TYPE_MAP[t.type])
+                add_value(t.value)
+                add_line(t.line)
+        self.n = len(types)
+        add_type(_EOF)
+        add_value('')
+        self.types = bytes(types)
+        self.values = tuple(values)
+        self.lines = lines
         self.pos = 0
-        self.current_token = self.tokens[0] if self.tokens else None
 
     def error(self, message):
-        if self.current_token:
-            t = self.current_token
-            raise SyntaxError(f"Syntax error at line {t.line}: {message}. Found '{t.value}' ({t.type})")
-        else:
-            raise SyntaxError(f"Syntax error at end of input: {message}")
+        pos = self.pos
+        if pos < self.n:
+            raise ParseError(message, self.lines[pos], self.values[pos], TYPE_NAMES[self.types[pos]])
+        raise ParseError(message)
 
     def advance(self):
         self.pos += 1
-        if self.pos < len(self.tokens):
-            self.current_token = self.tokens[self.pos]
-        else:
-            self.current_token = None
 
     def eat(self, token_type, value=None):
-        if self.current_token:
-            # Check type match
-            type_match = (self.current_token.type == token_type)
-            # Check value match if provided
-            value_match = (value is None) or (self.current_token.value == value)
-            
-            if type_match and value_match:
-                self.advance()
-            else:
-                expected = f"{token_type}" + (f" ('{value}')" if value else "")
-                self.error(f"Expected {expected}")
+        pos = self.pos
+        t_type = self.types[pos]
+        # Check type match, and value match if provided
+        if t_type == token_type and (value is None or self.values[pos] == value):
+            self.advance()
+        elif t_type == _EOF:
+            self.error(f"Unexpected end of input, expected {TYPE_NAMES[token_type]}")
+        else:
+            expected = f"{TYPE_NAMES[token_type]}" + (f" ('{value}')" if value else "")
+            self.error(f"Expected {expected}")
+
+    def expect(self, value):
+        # Fast path of eat(_SC, value) for punctuation. The scanner only ever
+        # produces '{', '}', '(', ')' and ';' as Special_characters, so the
+        # value alone identifies the token; eat() reports any mismatch.
+        if self.values[self.pos] == value:
+            self.pos += 1
         else:
-            self.error(f"Unexpected end of input, expected {token_type}")
+            self.eat(_SC, value)
 
     def parse(self):
         self.program()
-        if self.current_token is not None:
+        if self.types[self.pos] != _EOF:
             self.error("Unexpected tokens after valid program")
         return "Accepted"
 
@@ -57,93 +120,83 @@ class Parser:
         # - 'for'
         # - 'return'
         # - '{'
-        while self.current_token and self.is_statement_start():
-            self.statement()
+        while self.try_statement():
+            pass
 
-    def is_statement_start(self):
-        t = self.current_token
-        if not t: return False
-        if t.type == 'Keywords':
-            if t.value in ('int', 'float', 'double', 'bool', 'char', 'string', 'void', 'if', 'while', 'for', 'return'):
-                return True
-        if t.type == 'Identifiers':
-            return True
-        if t.type == 'Special_characters' and t.value == '{':
+    def try_statement(self):
+        # Parse one statement if one starts at the current token and return
+        # True; otherwise consume nothing and return False. Statements with a
+        # fixed leading token are found with a single lookup in
+        # _STMT_HANDLERS plus a type check; only declarations and assignments
+        # need further checks.
+        pos = self.pos
+        val = self.values[pos]
+        t_type = self.types[pos]
+        entry = _STMT_HANDLERS.get(val)
+        if entry is not None and entry[0] == t_type:
+            entry[1](self)
             return True
-        return False
-
-    def statement(self):
-        t = self.current_token
-        
-        # Block
-        if t.type == 'Special_characters' and t.value == '{':
-            self.block()
-            return
 
-        if t.type == 'Keywords':
-            val = t.value
-            # Control flow
-            if val == 'if':
-                self.if_statement()
-                return
-            if val == 'while':
-                self.while_statement()
-                return
-            if val == 'for':
-                self.for_statement()
-                return
-            if val == 'return':
-                self.return_statement()
-                return
-            # Type -> Declaration
-            if val in ('int', 'float', 'double', 'bool', 'char', 'string', 'void'):
-                self.declaration()
-                self.eat('Special_characters', ';')
-                return
+        # Type -> Declaration
+        if t_type == _KW and val in _TYPES:
+            self.declaration()
+            self.expect(';')
+            return True
 
         # Assignment
-        if t.type == 'Identifiers':
+        if t_type == _ID:
             self.assignment()
-            self.eat('Special_characters', ';')
-            return
+            self.expect(';')
+            return True
 
-        self.error("Invalid statement start")
+        return False
+
+    def statement(self):
+        if not self.try_statement():
+            if self.types[self.pos] == _EOF:
+                self.error("Unexpected end of input, expected statement")
+            self.error("Invalid statement start")
+
+    # The rules below are only entered after try_statement() (or for_statement()
+    # for declarations) has checked their leading token, so they step over it
+    # with a bare self.pos += 1 instead of re-checking it through eat().
 
     def block(self):
-        self.eat('Special_characters', '{')
+        self.pos += 1 # '{'
         self.statement_list()
-        self.eat('Special_characters', '}')
+        self.expect('}')
 
     def declaration(self):
         # <declaration> ::= <type> <identifier>
-        # Type is already checked/consumed in statement? No, peeked.
-        self.eat('Keywords') # consume type
-        self.eat('Identifiers')
+        # Type is already checked (peeked) by the caller.
+        self.pos += 1 # consume type
+        self.eat(_ID)
 
     def assignment(self):
         # <assignment> ::= <identifier> '=' <expression>
-        self.eat('Identifiers')
-        self.eat('Operators', '=')
+        self.eat(_ID)
+        self.eat(_OP, '=')
         self.expression()
 
     def if_statement(self):
         # "if" '(' <expression> ')' <statement> [ "else" <statement> ]
-        self.eat('Keywords', 'if')
-        self.eat('Special_characters', '(')
+        self.pos += 1 # 'if'
+        self.expect('(')
         self.expression()
-        self.eat('Special_characters', ')')
+        self.expect(')')
         self.statement()
         
-        if self.current_token and self.current_token.type == 'Keywords' and self.current_token.value == 'else':
-            self.eat('Keywords', 'else')
+        pos = self.pos
+        if self.types[pos] == _KW and self.values[pos] == 'else':
+            self.pos += 1 # 'else'
             self.statement()
 
     def while_statement(self):
         # "while" '(' <expression> ')' <statement>
-        self.eat('Keywords', 'while')
-        self.eat('Special_characters', '(')
+        self.pos += 1 # 'while'
+        self.expect('(')
         self.expression()
-        self.eat('Special_characters', ')')
+        self.expect(')')
         self.statement()
 
     def for_statement(self):
@@ -154,11 +207,12 @@ class Parser:
         # Actually proper C for loop: for (init; cond; update).
         # Init can be declaration or assignment.
         
-        self.eat('Keywords', 'for')
-        self.eat('Special_characters', '(')
+        self.pos += 1 # 'for'
+        self.expect('(')
         
         # Init
-        if self.current_token.type == 'Keywords' and self.current_token.value in ('int', 'float', 'double', 'bool', 'char', 'string', 'void'):
+        pos = self.pos
+        if self.types[pos] == _KW and self.values[pos] in _TYPES:
              self.declaration() # consumes type then identifier
              # Assuming declaration inside for loop doesn't have a semicolon terminator in this context? 
              # Standard C: for(int i=0; ...) -> that's a declaration with assignment.
@@ -170,23 +224,23 @@ class Parser:
         else:
              self.assignment() # identifier = expr
         
-        self.eat('Special_characters', ';')
+        self.expect(';')
         
         # Condition
         self.expression()
-        self.eat('Special_characters', ';')
+        self.expect(';')
         
         # Update
         self.assignment()
-        self.eat('Special_characters', ')')
+        self.expect(')')
         
         self.statement()
 
     def return_statement(self):
         # "return" <expression> ';'
-        self.eat('Keywords', 'return')
+        self.pos += 1 # 'return'
         self.expression()
-        self.eat('Special_characters', ';')
+        self.expect(';')
 
     # --- Expressions ---
     # Grammar:
@@ -194,44 +248,87 @@ class Parser:
     # <comparison> ::= <term> ( ('+' | '-') <term> )*
     # <term> ::= <factor> ( ('*' | '/') <factor> )*
     # <factor> ::= <identifier> | <number> | '(' <expression> ')' | "true" | "false"
+    #
+    # The expression grammar itself lives in _parse_expression() below, which
+    # only needs the token lists; this method maps its failures to errors.
 
     def expression(self):
-        self.comparison()
-        while self.current_token and self.current_token.type == 'Operators' and self.current_token.value in ('==', '!=', '<', '<=', '>', '>='):
-            self.eat('Operators', self.current_token.value)
-            self.comparison()
-
-    def comparison(self):
-        self.term()
-        while self.current_token and self.current_token.type == 'Operators' and self.current_token.value in ('+', '-'):
-            self.eat('Operators', self.current_token.value)
-            self.term()
-
-    def term(self):
-        self.factor()
-        while self.current_token and self.current_token.type == 'Operators' and self.current_token.value in ('*', '/'):
-            self.eat('Operators', self.current_token.value)
-            self.factor()
-
-    def factor(self):
-        t = self.current_token
-        if not t:
+        try:
+            self.pos = _parse_expression(self.types, self.values, self.pos)
+            return
+        except _ExpressionError as e:
+            pos, expected = e.args
+        self.pos = pos
+        if expected == ')':
+            self.eat(_SC, ')')
+        elif self.types[pos] == _EOF:
             self.error("Unexpected end of input in expression")
-
-        if t.type == 'Identifiers':
-            self.eat('Identifiers')
-        elif t.type == 'Numeric_constants':
-            self.eat('Numeric_constants') # covers integers and floats
-        elif t.type == 'Keywords' and t.value in ('true', 'false'):
-            self.eat('Keywords')
-        elif t.type == 'Special_characters' and t.value == '(':
-            self.eat('Special_characters', '(')
-            self.expression()
-            self.eat('Special_characters', ')')
         else:
             self.error("Expected identifier, number, boolean or '('")
 
 
+# Statements with a fixed leading token, keyed by value and paired with the
+# token type that value must have. The type still has to be checked: the
+# scanner can produce keyword spellings as Identifiers (e.g. '3if' scans as
+# a stray '3' followed by the identifier 'if'), and those are assignments.
+_STMT_HANDLERS = {
+    '{': (_SC, Parser.block),
+    'if': (_KW, Parser.if_statement),
+    'while': (_KW, Parser.while_statement),
+    'for': (_KW, Parser.for_statement),
+    'return': (_KW, Parser.return_statement),
+}
+
+
+class _ExpressionError(Exception):
+    """Raised by _parse_expression() with (position, expected) on malformed input."""
+
+
+def _parse_expression(types, values, pos):
+    """Recognise an <expression> starting at pos and return the position after it.
+
+    Works directly on the parser's parallel type/value lists (which end with
+    the EOF sentinel, so no bounds checks are needed), so everything below is
+    local variable access with no Parser attribute lookups. As in
+    Parser.expect(), parentheses are recognised by value alone.
+    Parenthesised groups are tracked with a depth counter instead of
+    recursion, so nesting costs no Python frames and cannot hit the
+    recursion limit. Operator precedence does not change which inputs are
+    accepted, and no tree is built, so no operator/operand stacks are needed.
+    """
+    depth = 0
+    while True:
+        # <factor>: any number of '(' followed by an operand
+        while values[pos] == '(':
+            depth += 1
+            pos += 1
+        t_type = types[pos]
+        if not (t_type == _ID or t_type == _NUM or (t_type == _KW and values[pos] in _BOOL_LITERALS)):
+            raise _ExpressionError(pos, None)
+        pos += 1
+
+        # Close finished groups until a binary operator continues the expression.
+        while not (types[pos] == _OP and values[pos] in _BINARY_OPS):
+            if depth == 0:
+                return pos
+            if values[pos] != ')':
+                raise _ExpressionError(pos, ')')
+            depth -= 1
+            pos += 1
+        pos += 1
+
+
+@lru_cache(maxsize=512)
+def parse_code(code):
+    # Tokenize and parse `code`, returning "Accepted" or the syntax error text.
+    # Results are memoised on the source string, so re-checking unchanged
+    # input (a REPL, an editor re-parsing on every keystroke) is a dict lookup.
+    try:
+        return Parser(tokenize(code)).parse()
+    except SyntaxError as e:
+        return str(e)
+
+
 def main():
     print("Type your C-like code. Enter an empty line to finish:")
     lines = []
@@ -249,12 +346,7 @@ def main():
         return
 
     try:
-        tokens = tokenize(code)
-        parser = Parser(tokens)
-        result = parser.parse()
-        print(result)
-    except SyntaxError as e:
-        print(e)
+        print(parse_code(code))
     except Exception as e:
         print(f"Error: {e}")
 
@@ -14,8 +14,13 @@ TOKEN_SPECIFICATIONS = [
     ('MISMATCH', r'.'),
 ]
 
+# The combined pattern is compiled once at import rather than on every call.
+TOKEN_REGEX = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_SPECIFICATIONS), re.MULTILINE | re.DOTALL)
+
 # --- 2. Token class ---
 class Token:
+    __slots__ = ('type', 'value', 'line', 'column')
+
     def __init__(self, type, value, line, column):
         self.type = type
         self.value = value
@@ -27,11 +32,12 @@ class Token:
 
 # --- 3. Tokenizer function ---
 def tokenize(code):
-    tokens = []
+    # Tokens are yielded one at a time as they are matched, so a consumer
+    # such as Parser can read them in the same pass without a token list
+    # ever being built. Use list(tokenize(code)) when a list is needed.
     line_num = 1
     line_start = 0
-    tok_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_SPECIFICATIONS)
-    get_token = re.compile(tok_regex, re.MULTILINE | re.DOTALL).match
+    get_token = TOKEN_REGEX.match
 
     pos = 0
     match = get_token(code)
@@ -47,10 +53,9 @@ def tokenize(code):
             print(f"Unexpected character {value!r} at line {line_num}")
         else:
             column = match.start() - line_start
-            tokens.append(Token(type, value, line_num, column))
+            yield Token(type, value, line_num, column)
         pos = match.end()
         match = get_token(code, pos)
-    return tokens
 
 # --- 4. Main Function ---
 def main():